@@ -3,6 +3,7 @@ from logging.config import dictConfig
 dictConfig(
     {
         "version": 1,
+        "disable_existing_loggers": False,
         "loggers": {
             "quart.app": {
                 "level": "ERROR",
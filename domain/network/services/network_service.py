@@ -1,14 +1,108 @@
 import os
-import json
 import tempfile
 import asyncio
+import gzip
+import hashlib
+import json
 import logging
-import glob
-from contextlib import contextmanager
-from typing import Optional, Tuple, Dict, Any
-
+import re
+import shutil
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from operator import itemgetter
+from typing import Optional, Tuple, Dict, Any, List
+
+import orjson
 import pypowsybl.network as pn
 
+# Version of the SVG post-processing of rendered diagrams, bump it whenever
+# that processing changes so clients don't keep diagrams rendered before
+RENDER_VERSION = 1
+
+
+class SingleLineDiagram:
+    """A rendered single line diagram and its serialized forms.
+
+    Response bodies are encoded on first use and kept with the diagram, so a
+    cached diagram is only serialized once. Encoding can take a while for
+    large diagrams, so body() is meant to run in a worker thread. The SVG is
+    only kept UTF-8 encoded, to avoid holding a second copy of it.
+    """
+
+    # Compressed once per cached diagram, so favour ratio over speed
+    GZIP_LEVEL = 6
+
+    # Suffix of the gzip compressed version of a body form
+    GZIP_SUFFIX = "+gzip"
+
+    # Indentation between tags. Like any whitespace, it would render as a space
+    # between inline text content (<tspan>s); stripping it is only safe because
+    # pypowsybl puts each label in its own <text> element without <tspan>
+    # children, so it only ever separates sibling elements
+    _INDENT_RE = re.compile(r">\s*\n\s*<")
+
+    def __init__(self, svg: str, metadata: Dict[str, Any]):
+        self.metadata = metadata
+
+        # Small, and needed to build SVG responses without waiting on a thread
+        self.metadata_header = json.dumps(metadata)
+
+        self._bodies: Dict[str, bytes] = {"svg": svg.encode("utf-8")}
+
+    @property
+    def nbytes(self) -> int:
+        """Get the size of the encoded bodies kept with the diagram."""
+        return sum(len(body) for body in list(self._bodies.values()))
+
+    @classmethod
+    def minify_svg(cls, svg: str) -> str:
+        """Strip the indentation between the tags of an SVG document."""
+        return cls._INDENT_RE.sub("><", svg)
+
+    def cached_body(self, form: str) -> Optional[bytes]:
+        """Get a response body if it was already encoded.
+
+        Args:
+            form: Body form, see body()
+
+        Returns:
+            Optional[bytes]: The body, or None if it wasn't encoded yet
+        """
+        return self._bodies.get(form)
+
+    def body(self, form: str) -> bytes:
+        """Get a response body, encoding it on first use.
+
+        Args:
+            form: "svg" for the UTF-8 encoded SVG, "json" for the SVG and
+                metadata as a JSON object, "metadata" for the metadata as
+                JSON, any of them followed by "+gzip" for its gzip
+                compressed version
+
+        Returns:
+            bytes: The encoded body
+        """
+        body = self._bodies.get(form)
+        if body is None:
+            body = self._bodies[form] = self._encode(form)
+        return body
+
+    def _encode(self, form: str) -> bytes:
+        """Encode a response body without keeping it."""
+        if form.endswith(self.GZIP_SUFFIX):
+            base = form[: -len(self.GZIP_SUFFIX)]
+            content = self._bodies.get(base) or self._encode(base)
+            return gzip.compress(content, compresslevel=self.GZIP_LEVEL)
+        if form == "json":
+            svg = self._bodies["svg"].decode("utf-8")
+            return orjson.dumps({"svg": svg, "metadata": self.metadata})
+        if form == "metadata":
+            return orjson.dumps(self.metadata)
+        raise ValueError(f"Unknown diagram body form: {form}")
+
 
 class NetworkService:
     """Service for electrical network operations using pypowsybl with persistence support."""
@@ -38,14 +132,84 @@ class NetworkService:
         "substation_description_displayed": True,
     }
 
+    # Exported dataframe columns as (JSON key, column name, default value)
+    SUBSTATION_FIELDS = (
+        ("name", "name", ""),
+        ("country", "country", ""),
+        ("tso", "TSO", ""),
+        ("geo_tags", "geo_tags", ""),
+    )
+
+    VOLTAGE_LEVEL_FIELDS = (
+        ("name", "name", ""),
+        ("substation_id", "substation_id", ""),
+        ("nominal_v", "nominal_v", 0),
+        ("high_voltage_limit", "high_voltage_limit", 0),
+        ("low_voltage_limit", "low_voltage_limit", 0),
+        ("topology_kind", "topology_kind", ""),
+    )
+
+    # Voltage level fields listed under their substation
+    SUBSTATION_VOLTAGE_LEVEL_FIELDS = tuple(
+        field for field in VOLTAGE_LEVEL_FIELDS if field[0] != "substation_id"
+    )
+
+    # Maximum size of the encoded single line diagrams kept in memory
+    SLD_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256 Mo
+
+    # Diagrams rendered in the background after a network is loaded, stopping
+    # well below the cache budget so on-demand diagrams still fit
+    SLD_PRERENDER_COUNT = 64
+    SLD_PRERENDER_MAX_BYTES = SLD_CACHE_MAX_BYTES // 4
+
+    # JSON payloads are compressed once per network, so favour ratio over speed
+    JSON_GZIP_LEVEL = 6
+
     # Storage paths
     UPLOAD_FOLDER = "uploads"
     LAST_NETWORK_FILE = os.path.join(UPLOAD_FOLDER, "last_loaded_network.json")
+    _XIIDM_SUFFIX = ".xiidm"
+
+    # Copy buffer for uploaded network files
+    UPLOAD_BUFFER_SIZE = 1024 * 1024  # 1 Mo
 
     def __init__(self):
         """Initialize the NetworkService."""
         self._current_network = None
         self._current_file_path = None
+        self._current_filename: Optional[str] = None
+        self._network_fingerprint: Optional[str] = None
+        self._voltage_level_ids: frozenset = frozenset()
+        self._substation_ids: frozenset = frozenset()
+        self._line_count = 0
+        self._sld_cache: "OrderedDict[tuple, SingleLineDiagram]" = OrderedDict()
+        self._sld_rendering: Dict[tuple, asyncio.Task] = {}
+        self._json_cache: Dict[str, bytes] = {}
+        self._voltage_levels_by_substation: Optional[Dict[str, list]] = None
+        self._prerender_task: Optional[asyncio.Task] = None
+
+        # Dedicated threads for blocking pypowsybl and file calls, so they don't
+        # compete with other users of the event loop's default executor
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(2, os.cpu_count() or 1), thread_name_prefix="pypowsybl"
+        )
+
+        # Diagram parameters never change, build them once
+        self._sld_params = pn.SldParameters(**self.SLD_PARAMETERS)
+
+        # Identifies how diagrams are rendered, for validators that must change
+        # with the rendering even when the network doesn't
+        render_key = orjson.dumps(
+            {"version": RENDER_VERSION, "parameters": self.SLD_PARAMETERS},
+            option=orjson.OPT_SORT_KEYS,
+        )
+        self._render_version = hashlib.blake2b(render_key, digest_size=8).hexdigest()
+
+        # Warm up the pypowsybl runtime so the first request doesn't pay for it
+        try:
+            pn.create_empty("_warmup")
+        except Exception as e:
+            logging.warning(f"pypowsybl warm-up failed: {str(e)}")
 
         # Ensure upload folder exists
         os.makedirs(self.UPLOAD_FOLDER, exist_ok=True)
@@ -58,32 +222,293 @@ class NetworkService:
     @current_network.setter
     def current_network(self, network):
         """Set the current network."""
+        # Networks built in memory have no file to derive a fingerprint from
+        fingerprint = uuid.uuid4().hex if network is not None else None
+        self._activate_network(network, self._index_network(network), fingerprint)
+
+    @staticmethod
+    def _index_network(network) -> Tuple[frozenset, frozenset, int]:
+        """Collect the element IDs of a network for constant-time lookups.
+
+        Args:
+            network: The network to index, or None
+
+        Returns:
+            tuple: (voltage level IDs, substation IDs, number of lines)
+        """
+        if network is None:
+            return frozenset(), frozenset(), 0
+
+        return (
+            frozenset(network.get_voltage_levels().index),
+            frozenset(network.get_substations().index),
+            len(network.get_lines()),
+        )
+
+    @staticmethod
+    def _fingerprint_file(file_path: str) -> str:
+        """Identify the content of a network file without reading it.
+
+        Args:
+            file_path: Path to the network file
+
+        Returns:
+            str: Hex digest of the file's absolute path, size and mtime
+        """
+        stat = os.stat(file_path)
+        key = f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    def _activate_network(
+        self,
+        network,
+        index: Tuple[frozenset, frozenset, int],
+        fingerprint: Optional[str],
+    ):
+        """Make a network current and reset everything derived from the previous one.
+
+        Args:
+            network: The new current network
+            index: The network's IDs and counts as returned by _index_network
+            fingerprint: Identifier of the network content
+        """
         self._current_network = network
+        self._network_fingerprint = fingerprint
+        self._voltage_level_ids, self._substation_ids, self._line_count = index
+        self._sld_cache.clear()
+        self._json_cache.clear()
+        self._voltage_levels_by_substation = None
+
+        # Stop pre-rendering diagrams of the previous network
+        if self._prerender_task is not None:
+            self._prerender_task.cancel()
+            self._prerender_task = None
 
     @property
     def current_file_path(self):
         """Get the path to the currently loaded network file."""
         return self._current_file_path
 
-    @contextmanager
-    def _temp_file(self, suffix: str):
-        """Context manager for creating and cleaning up temporary files.
+    @property
+    def current_filename(self) -> Optional[str]:
+        """Get the file name of the currently loaded network file."""
+        return self._current_filename
+
+    @property
+    def element_counts(self) -> Dict[str, int]:
+        """Get the number of elements of the current network, counted at load."""
+        return {
+            "substations_count": len(self._substation_ids),
+            "voltage_levels_count": len(self._voltage_level_ids),
+            "lines_count": self._line_count,
+        }
+
+    @property
+    def network_fingerprint(self) -> Optional[str]:
+        """Get an identifier of the current network content.
+
+        It changes whenever a different network is loaded, and stays the same
+        across restarts for a network reloaded from the same file.
+        """
+        return self._network_fingerprint
+
+    @property
+    def render_version(self) -> str:
+        """Get an identifier of the diagram rendering parameters and processing."""
+        return self._render_version
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking call in the service's thread pool.
 
         Args:
-            suffix: File extension (e.g., '.svg', '.json')
+            func: The blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
 
-        Yields:
-            str: Path to the temporary file
+        Returns:
+            The result of func
         """
-        temp_file = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
-        file_path = temp_file.name
-        temp_file.close()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    @staticmethod
+    def _dataframe_records(df, fields) -> List[Dict[str, Any]]:
+        """Convert a pypowsybl dataframe into a list of JSON-ready records.
+
+        Columns are extracted whole instead of iterating rows, so no
+        per-row Series is allocated.
 
+        Args:
+            df: Dataframe indexed by element ID
+            fields: Sequence of (JSON key, column name, default value)
+
+        Returns:
+            List[Dict[str, Any]]: One record per row, starting with its "id"
+        """
+        columns = {
+            key: df[column].tolist() if column in df.columns else [default] * len(df)
+            for key, column, default in fields
+        }
+
+        # Add optional attributes if available
+        if "fictitious" in df.columns:
+            columns["fictitious"] = df["fictitious"].astype(bool).tolist()
+
+        keys = ("id", *columns)
+        return [
+            dict(zip(keys, row)) for row in zip(df.index.tolist(), *columns.values())
+        ]
+
+    @staticmethod
+    def _read_json(file_path: str) -> Any:
+        """Read and parse a JSON file."""
+        with open(file_path, "rb") as f:
+            return orjson.loads(f.read())
+
+    @staticmethod
+    def _write_json(file_path: str, content: Any) -> None:
+        """Atomically serialize content to a JSON file.
+
+        The content is written to a sibling temporary file which then replaces
+        the target, so readers never see a truncated file.
+        """
+        data = orjson.dumps(content)
+        fd, temp_path = tempfile.mkstemp(
+            suffix=".tmp", dir=os.path.dirname(file_path) or "."
+        )
         try:
-            yield file_path
-        finally:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _scan_networks(self) -> List[Tuple[str, float]]:
+        """List the network files in the uploads folder.
+
+        Returns:
+            List[Tuple[str, float]]: (file path, modification time) pairs
+        """
+        # DirEntry caches its stat result, so each file is stat'ed only once
+        with os.scandir(self.UPLOAD_FOLDER) as it:
+            return [
+                (entry.path, entry.stat().st_mtime)
+                for entry in it
+                if entry.name.endswith(self._XIIDM_SUFFIX) and entry.is_file()
+            ]
+
+    @staticmethod
+    def _remove_files(file_paths: List[str]) -> Tuple[List[str], List[str]]:
+        """Remove files, carrying on past the ones that can't be removed.
+
+        Args:
+            file_paths: Paths of the files to remove
+
+        Returns:
+            tuple: (removed file paths, failure descriptions)
+        """
+        removed, failures = [], []
+        for file_path in file_paths:
+            try:
+                os.unlink(file_path)
+                removed.append(file_path)
+            except OSError as e:
+                failures.append(f"{file_path}: {str(e)}")
+
+        return removed, failures
+
+    @staticmethod
+    def _stream_fileno(stream) -> Optional[int]:
+        """Get the file descriptor of a stream backed by a file on disk, if any."""
+        # Asking an in-memory spooled file for its descriptor would first
+        # write it to disk
+        if not getattr(stream, "_rolled", True):
+            return None
+
+        try:
+            return stream.fileno()
+        except (AttributeError, OSError):
+            return None
+
+    @classmethod
+    def _copy_stream(cls, stream, destination: str) -> None:
+        """Copy a binary stream to a file using large buffers.
+
+        Streams backed by a file on disk, like spooled uploads that rolled
+        over, are copied by the kernel with sendfile when it is available.
+
+        Args:
+            stream: Readable binary file-like object
+            destination: Path of the file to write
+        """
+        source_fd = cls._stream_fileno(stream)
+        with open(destination, "wb", buffering=cls.UPLOAD_BUFFER_SIZE) as f:
+            if source_fd is not None and hasattr(os, "sendfile"):
+                offset = stream.tell()
+                size = os.fstat(source_fd).st_size
+                try:
+                    while offset < size:
+                        sent = os.sendfile(f.fileno(), source_fd, offset, size - offset)
+                        if not sent:
+                            break
+                        offset += sent
+                    return
+                except OSError:
+                    # Not supported for these files, copy the rest in Python
+                    stream.seek(offset)
+
+            shutil.copyfileobj(stream, f, cls.UPLOAD_BUFFER_SIZE)
+
+    async def save_upload(self, stream, destination: str) -> None:
+        """Write an uploaded file to disk without blocking the event loop.
+
+        Args:
+            stream: Readable binary stream of the uploaded file
+            destination: Path of the file to write
+        """
+        await self._run_blocking(self._copy_stream, stream, destination)
+
+    async def save_upload_body(self, chunks, destination: str) -> None:
+        """Write a request body to disk as it arrives.
+
+        Chunks are gathered into large buffers so each write handed to the
+        thread pool is big. A partially written file is removed on failure so
+        it can't be mistaken for a network later.
+
+        Args:
+            chunks: Async iterable of the body's byte chunks
+            destination: Path of the file to write
+        """
+        # Buffered writes either write everything or raise, unlike raw ones
+        # which may write only part of the data
+        f = await self._run_blocking(open, destination, "wb")
+        try:
+            buffer = bytearray()
+            async for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= self.UPLOAD_BUFFER_SIZE:
+                    await self._run_blocking(f.write, buffer)
+                    buffer.clear()
+
+            if buffer:
+                await self._run_blocking(f.write, buffer)
+
+            await self._run_blocking(f.close)
+        except BaseException:
+            await self._run_blocking(f.close)
+            await self._run_blocking(self._remove_files, [destination])
+            raise
+
+    async def remove_upload(self, file_path: str) -> None:
+        """Remove an uploaded file without blocking the event loop.
+
+        Args:
+            file_path: Path of the file to remove
+        """
+        await self._run_blocking(os.unlink, file_path)
 
     async def process_iidm_file(self, file_path: str) -> Optional[str]:
         """Load an IIDM file and set it as the current network.
@@ -95,26 +520,34 @@ class NetworkService:
             Optional[str]: Error message if loading fails, None otherwise
         """
         try:
-            network = pn.load(file_path)
-            self.current_network = network
+            # Parsing runs in a worker thread to keep the event loop responsive
+            network = await self._run_blocking(pn.load, file_path)
+            index = await self._run_blocking(self._index_network, network)
+            fingerprint = await self._run_blocking(self._fingerprint_file, file_path)
+            self._activate_network(network, index, fingerprint)
             self._current_file_path = file_path
+            self._current_filename = os.path.basename(file_path)
+
+            # Started before any await, so a newer load always cancels it
+            self._prerender_task = asyncio.create_task(
+                self._prerender_diagrams(network)
+            )
 
             # Save information about the last loaded network
-            self._save_network_metadata()
+            await self._save_network_metadata()
 
             return None
         except Exception as e:
             return f"Error loading network: {str(e)}"
 
-    def _save_network_metadata(self):
+    async def _save_network_metadata(self):
         """Save metadata about the current network for persistence."""
         try:
             metadata = {
                 "file_path": self._current_file_path,
-                "timestamp": asyncio.get_event_loop().time(),
+                "timestamp": time.time(),
             }
-            with open(self.LAST_NETWORK_FILE, "w") as f:
-                json.dump(metadata, f)
+            await self._run_blocking(self._write_json, self.LAST_NETWORK_FILE, metadata)
         except Exception as e:
             logging.error(f"Failed to save network metadata: {str(e)}")
 
@@ -131,8 +564,7 @@ class NetworkService:
                 return await self._load_most_recent_network()
 
             # Load the metadata
-            with open(self.LAST_NETWORK_FILE, "r") as f:
-                metadata = json.load(f)
+            metadata = await self._run_blocking(self._read_json, self.LAST_NETWORK_FILE)
 
             file_path = metadata.get("file_path")
             if not file_path or not os.path.exists(file_path):
@@ -153,13 +585,13 @@ class NetworkService:
         """
         try:
             # Find all network files in the uploads folder
-            files = glob.glob(os.path.join(self.UPLOAD_FOLDER, "*.xiidm"))
+            entries = await self._run_blocking(self._scan_networks)
 
-            if not files:
+            if not entries:
                 return "No previous network files found"
 
             # Get the most recent file
-            latest_file = max(files, key=os.path.getmtime)
+            latest_file = max(entries, key=itemgetter(1))[0]
 
             # Load the network
             return await self.process_iidm_file(latest_file)
@@ -175,28 +607,29 @@ class NetworkService:
         """
         try:
             # Find all network files in the uploads folder
-            files = glob.glob(os.path.join(self.UPLOAD_FOLDER, "*.xiidm"))
+            entries = await self._run_blocking(self._scan_networks)
 
-            if len(files) <= max_files:
+            if len(entries) <= max_files:
                 return
 
             # Sort files by modification time, oldest first
-            files.sort(key=os.path.getmtime)
+            entries.sort(key=itemgetter(1))
 
             # Remove oldest files, keeping only max_files
-            for file_path in files[:-max_files]:
-                try:
-                    os.remove(file_path)
-                    logging.info(f"Removed old network file: {file_path}")
-                except Exception as e:
-                    logging.error(
-                        f"Failed to remove old network file {file_path}: {str(e)}"
-                    )
+            old_files = [file_path for file_path, _ in entries[:-max_files]]
+            removed, failures = await self._run_blocking(self._remove_files, old_files)
+
+            if removed:
+                logging.info(f"Removed old network files: {', '.join(removed)}")
+            if failures:
+                logging.error(
+                    f"Failed to remove old network files: {'; '.join(failures)}"
+                )
 
         except Exception as e:
             logging.error(f"Error during network cleanup: {str(e)}")
 
-    async def element_exists(self, element_id: str) -> bool:
+    def element_exists(self, element_id: str) -> bool:
         """Check if an element exists in the current network.
 
         Args:
@@ -205,162 +638,364 @@ class NetworkService:
         Returns:
             bool: True if the element exists, False otherwise
         """
-        if not self.current_network:
-            return False
+        # The ID sets are built once per network when it is loaded
+        return (
+            element_id in self._voltage_level_ids or element_id in self._substation_ids
+        )
 
-        try:
-            # Check in voltage levels
-            voltage_levels = self.current_network.get_voltage_levels()
-            if element_id in voltage_levels.index:
-                return True
+    def substation_exists(self, substation_id: str) -> bool:
+        """Check if a substation exists in the current network.
 
-            # Check in substations
-            substations = self.current_network.get_substations()
-            if element_id in substations.index:
-                return True
+        Args:
+            substation_id: The substation ID to check
 
-            return False
-        except Exception:
-            return False
+        Returns:
+            bool: True if the substation exists, False otherwise
+        """
+        return substation_id in self._substation_ids
+
+    def _render_single_line_diagram(
+        self, network, element_id: str
+    ) -> SingleLineDiagram:
+        """Render a single line diagram in memory.
+
+        Args:
+            network: The network containing the element
+            element_id: The element ID (voltage level or substation)
+
+        Returns:
+            SingleLineDiagram: The SVG diagram content and its JSON metadata
+        """
+        diagram = network.get_single_line_diagram(
+            element_id, parameters=self._sld_params
+        )
+        return SingleLineDiagram(
+            SingleLineDiagram.minify_svg(diagram.svg), orjson.loads(diagram.metadata)
+        )
 
     async def generate_single_line_diagram(
         self, element_id: str
-    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    ) -> Tuple[Optional[SingleLineDiagram], Optional[str]]:
         """Generate a single line diagram for a network element.
 
         Args:
             element_id: The element ID (voltage level or substation)
 
         Returns:
-            tuple: (SVG diagram content, JSON metadata) or (None, None) on error
+            tuple: (diagram, error message) where one will be None
         """
-        if not self.current_network:
-            return None, None
+        network = self.current_network
+        if not network:
+            return None, "No network loaded"
 
-        # Configure diagram parameters
-        params = pn.SldParameters(**self.SLD_PARAMETERS)
+        # Diagrams are deterministic for a given network, serve repeats from cache
+        key = (self._network_fingerprint, element_id)
+        diagram = self._sld_cache.get(key)
+        if diagram is not None:
+            self._sld_cache.move_to_end(key)
+            return diagram, None
+
+        # Concurrent requests for the same diagram share a single rendering,
+        # which goes on even if the request that started it is cancelled
+        task = self._sld_rendering.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._render_and_cache(network, key, element_id)
+            )
+            self._sld_rendering[key] = task
+
+        return await asyncio.shield(task)
+
+    async def _render_and_cache(
+        self, network, key: tuple, element_id: str
+    ) -> Tuple[Optional[SingleLineDiagram], Optional[str]]:
+        """Render a single line diagram in the thread pool and cache it.
+
+        Args:
+            network: The network containing the element
+            key: Cache key of the diagram
+            element_id: The element ID (voltage level or substation)
 
+        Returns:
+            tuple: (diagram, error message) where one will be None
+        """
         try:
-            with (
-                self._temp_file(".svg") as svg_path,
-                self._temp_file(".json") as metadata_path,
-            ):
-                # Generate the SVG with metadata
-                self.current_network.write_single_line_diagram_svg(
-                    container_id=element_id,
-                    svg_file=svg_path,
-                    metadata_file=metadata_path,
-                    parameters=params,
-                )
+            diagram = await self._run_blocking(
+                self._render_single_line_diagram, network, element_id
+            )
+        except Exception as e:
+            return None, str(e)
+        finally:
+            del self._sld_rendering[key]
 
-                # Read the generated SVG content
-                with open(svg_path, "r") as svg_file:
-                    svg_content = svg_file.read()
+        # Don't cache diagrams of a network replaced while rendering
+        if network is self.current_network:
+            self._sld_cache[key] = diagram
+            self._trim_sld_cache()
 
-                # Read the generated metadata
-                with open(metadata_path, "r") as metadata_file:
-                    metadata_content = json.load(metadata_file)
+        return diagram, None
 
-                return svg_content, metadata_content
-        except Exception as e:
-            return None, {"error": str(e)}
+    async def get_diagram_body(self, diagram: SingleLineDiagram, form: str) -> bytes:
+        """Get a response body of a diagram without encoding on the event loop.
+
+        Args:
+            diagram: The rendered diagram
+            form: Body form, as accepted by SingleLineDiagram.body
+
+        Returns:
+            bytes: The encoded body
+        """
+        body = diagram.cached_body(form)
+        if body is None:
+            body = await self._run_blocking(diagram.body, form)
+
+            # The new body counts towards the cache budget
+            self._trim_sld_cache()
+        return body
+
+    def _sld_cache_bytes(self) -> int:
+        """Get the size of the encoded diagrams in the cache."""
+        return sum(diagram.nbytes for diagram in self._sld_cache.values())
+
+    def _trim_sld_cache(self):
+        """Evict the least recently used diagrams until the cache fits its budget.
+
+        The most recently used diagram is always kept, even if it is larger
+        than the whole budget.
+        """
+        total = self._sld_cache_bytes()
+        while total > self.SLD_CACHE_MAX_BYTES and len(self._sld_cache) > 1:
+            _, diagram = self._sld_cache.popitem(last=False)
+            total -= diagram.nbytes
+
+    async def _prerender_diagrams(self, network):
+        """Render the first diagrams of a newly loaded network ahead of requests.
+
+        Diagrams are rendered one at a time so requests still find free
+        workers in the thread pool, until the cache holds a quarter of its
+        budget.
+
+        Args:
+            network: The network that was loaded
+        """
+        element_ids = [*sorted(self._substation_ids), *sorted(self._voltage_level_ids)]
+        rendered = 0
+        for element_id in element_ids[: self.SLD_PRERENDER_COUNT]:
+            if network is not self.current_network:
+                return
+            if self._sld_cache_bytes() >= self.SLD_PRERENDER_MAX_BYTES:
+                break
+
+            diagram, _ = await self.generate_single_line_diagram(element_id)
+            if diagram is not None:
+                rendered += 1
+
+        logging.info(f"Pre-rendered {rendered} single line diagrams")
+
+    @staticmethod
+    def _export_json(network) -> bytes:
+        """Export a network to JIIDM, pypowsybl's JSON format.
+
+        Args:
+            network: The network to export
+
+        Returns:
+            bytes: The UTF-8 encoded JSON document
+        """
+        return network.save_to_string(format="JIIDM").encode("utf-8")
 
     async def convert_network_to_json(
-        self,
-    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        self, compressed: bool = False
+    ) -> Tuple[Optional[bytes], Optional[str]]:
         """Convert the current network to JSON format.
 
+        The export is already JSON, so it is returned encoded and ready to send
+        rather than parsed into Python objects. The compressed export is kept
+        until another network is loaded, the uncompressed one is too large to
+        keep and is exported on each call.
+
+        Args:
+            compressed: Whether to get the gzip compressed JSON
+
         Returns:
-            tuple: (JSON content, error message) where one will be None
+            tuple: (UTF-8 encoded JSON content, error message) where one will be None
         """
         if not self.current_network:
             return None, "No network loaded"
 
         try:
-            with self._temp_file(".jiidm") as json_path:
-                # Export network to JSON format
-                self.current_network.save(json_path, format="JIIDM")
-
-                # Read the generated JSON content
-                with open(json_path, "r", encoding="utf-8") as json_file:
-                    json_content = json.load(json_file)
+            if compressed:
+                json_content = await self._cached_json(
+                    "network", self._export_json, compressed=True
+                )
+            else:
+                # Export network to JSON format in memory
+                json_content = await self._run_blocking(
+                    self._export_json, self.current_network
+                )
 
-                return json_content, None
-        except json.JSONDecodeError as je:
-            return None, f"Error parsing JSON: {str(je)}"
+            return json_content, None
         except Exception as e:
             return None, f"Error converting network to JSON: {str(e)}"
 
-    async def get_substations(self) -> Tuple[Dict[str, Any], Optional[str]]:
+    @classmethod
+    def _compress_json(cls, build, network, content: Optional[bytes]) -> bytes:
+        """Gzip a JSON payload, building it first if it isn't given."""
+        if content is None:
+            content = build(network)
+        return gzip.compress(content, compresslevel=cls.JSON_GZIP_LEVEL)
+
+    async def _cached_json(self, key: str, build, compressed: bool = False) -> bytes:
+        """Get a serialized JSON payload of the current network, building it once.
+
+        Args:
+            key: Name of the payload in the cache
+            build: Blocking callable taking the network and returning the payload
+            compressed: Whether to get the gzip compressed payload instead
+
+        Returns:
+            bytes: The UTF-8 encoded JSON payload, gzip compressed if requested
+        """
+        network = self.current_network
+        cache_key = f"{key}+gzip" if compressed else key
+        content = self._json_cache.get(cache_key)
+        if content is None:
+            if compressed:
+                # Reuse the uncompressed payload if it was already built
+                content = await self._run_blocking(
+                    self._compress_json, build, network, self._json_cache.get(key)
+                )
+            else:
+                content = await self._run_blocking(build, network)
+
+            # Don't cache payloads of a network replaced while building
+            if network is self.current_network:
+                self._json_cache[cache_key] = content
+
+        return content
+
+    def _substations_json(self, network) -> bytes:
+        """Serialize all substations of a network."""
+        substations_df = network.get_substations()
+        return orjson.dumps(
+            {
+                "substations": self._dataframe_records(
+                    substations_df, self.SUBSTATION_FIELDS
+                )
+            }
+        )
+
+    def _voltage_levels_json(self, network) -> bytes:
+        """Serialize all voltage levels of a network."""
+        voltage_levels_df = network.get_voltage_levels()
+        return orjson.dumps(
+            {
+                "voltage_levels": self._dataframe_records(
+                    voltage_levels_df, self.VOLTAGE_LEVEL_FIELDS
+                )
+            }
+        )
+
+    async def get_substations(
+        self, compressed: bool = False
+    ) -> Tuple[Optional[bytes], Optional[str]]:
         """Get a JSON representation of all substations in the network.
 
+        The payload is serialized (and compressed) once per loaded network.
+
+        Args:
+            compressed: Whether to get the gzip compressed JSON
+
         Returns:
-            tuple: (JSON content, error message) where one will be None
+            tuple: (UTF-8 encoded JSON content, error message) where one will be None
         """
         if not self.current_network:
             return None, "No network loaded"
 
         try:
-            # Get substations dataframe
-            substations_df = self.current_network.get_substations()
-
-            # Create the result dictionary
-            result = {"substations": []}
-
-            # Process each substation
-            for substation_id, substation in substations_df.iterrows():
-                substation_data = {
-                    "id": substation_id,
-                    "name": substation.get("name", ""),
-                    "country": substation.get("country", ""),
-                    "tso": substation.get("TSO", ""),
-                    "geo_tags": substation.get("geo_tags", ""),
-                }
-
-                # Add optional attributes if available
-                if "fictitious" in substation:
-                    substation_data["fictitious"] = bool(substation["fictitious"])
-
-                result["substations"].append(substation_data)
-
-            return result, None
+            content = await self._cached_json(
+                "substations", self._substations_json, compressed
+            )
+            return content, None
         except Exception as e:
             return None, f"Error retrieving substations: {str(e)}"
 
-    async def get_voltage_levels(self) -> Tuple[Dict[str, Any], Optional[str]]:
+    async def get_voltage_levels(
+        self, compressed: bool = False
+    ) -> Tuple[Optional[bytes], Optional[str]]:
         """Get a JSON representation of all voltage levels in the network.
 
+        The payload is serialized (and compressed) once per loaded network.
+
+        Args:
+            compressed: Whether to get the gzip compressed JSON
+
         Returns:
-            tuple: (JSON content, error message) where one will be None
+            tuple: (UTF-8 encoded JSON content, error message) where one will be None
         """
         if not self.current_network:
             return None, "No network loaded"
 
         try:
-            # Get voltage levels dataframe
-            voltage_levels_df = self.current_network.get_voltage_levels()
-
-            # Create the result dictionary
-            result = {"voltage_levels": []}
-
-            # Process each voltage level
-            for vl_id, vl in voltage_levels_df.iterrows():
-                vl_data = {
-                    "id": vl_id,
-                    "name": vl.get("name", ""),
-                    "substation_id": vl.get("substation_id", ""),
-                    "nominal_v": vl.get("nominal_v", 0),
-                    "high_voltage_limit": vl.get("high_voltage_limit", 0),
-                    "low_voltage_limit": vl.get("low_voltage_limit", 0),
-                    "topology_kind": vl.get("topology_kind", ""),
-                }
+            content = await self._cached_json(
+                "voltage_levels", self._voltage_levels_json, compressed
+            )
+            return content, None
+        except Exception as e:
+            return None, f"Error retrieving voltage levels: {str(e)}"
 
-                # Add optional attributes if available
-                if "fictitious" in vl:
-                    vl_data["fictitious"] = bool(vl["fictitious"])
+    def _group_voltage_levels(self, network) -> Dict[str, list]:
+        """Group the voltage level records of a network by substation.
 
-                result["voltage_levels"].append(vl_data)
+        Args:
+            network: The network containing the voltage levels
 
-            return result, None
+        Returns:
+            Dict[str, list]: Voltage level records keyed by substation ID
+        """
+        voltage_levels_df = network.get_voltage_levels()
+        records = self._dataframe_records(
+            voltage_levels_df, self.SUBSTATION_VOLTAGE_LEVEL_FIELDS
+        )
+        groups = voltage_levels_df.groupby("substation_id", sort=False).indices
+        return {
+            substation_id: [records[i] for i in positions]
+            for substation_id, positions in groups.items()
+        }
+
+    async def get_substation_voltage_levels(
+        self, substation_id: str
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        """Get a JSON representation of the voltage levels of a substation.
+
+        Voltage levels are grouped by substation once per loaded network, so
+        each request is a dictionary lookup.
+
+        Args:
+            substation_id: The ID of the substation
+
+        Returns:
+            tuple: (UTF-8 encoded JSON content, error message) where one will be None
+        """
+        if not self.current_network:
+            return None, "No network loaded"
+
+        try:
+            network = self.current_network
+            groups = self._voltage_levels_by_substation
+            if groups is None:
+                groups = await self._run_blocking(self._group_voltage_levels, network)
+
+                # Don't keep groups of a network replaced while building them
+                if network is self.current_network:
+                    self._voltage_levels_by_substation = groups
+
+            content = orjson.dumps(
+                {
+                    "substation_id": substation_id,
+                    "voltage_levels": groups.get(substation_id, []),
+                }
+            )
+            return content, None
         except Exception as e:
             return None, f"Error retrieving voltage levels: {str(e)}"
@@ -0,0 +1,53 @@
+import asyncio
+import gzip
+
+from quart import request
+from quart.wrappers.response import DataBody
+
+# Text responses worth compressing on the fly
+COMPRESSIBLE_MIMETYPES = frozenset({"application/json", "image/svg+xml"})
+
+# Smaller bodies don't shrink enough to be worth the CPU time
+MIN_COMPRESS_SIZE = 4096
+
+# Fast level, most of the size reduction of text comes from the first levels
+COMPRESS_LEVEL = 1
+
+
+def register_compression(app):
+    """Compress large JSON and SVG responses for clients accepting gzip.
+
+    This covers responses built per request. Routes serving cached payloads
+    (network export, listings, diagrams) compress them once and set
+    Content-Encoding themselves, and diagram routes pick an ETag per
+    encoding, so responses with either header are sent unchanged, as are
+    streamed bodies.
+
+    Args:
+        app: The Quart application
+    """
+
+    @app.after_request
+    async def compress_response(response):
+        if (
+            response.status_code != 200
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or not isinstance(response.response, DataBody)
+            or "Content-Encoding" in response.headers
+            or "ETag" in response.headers
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        if "gzip" not in request.accept_encodings:
+            return response
+
+        data = await response.get_data()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return response
+
+        # Large payloads take a while to compress, keep the event loop free
+        compressed = await asyncio.to_thread(gzip.compress, data, COMPRESS_LEVEL)
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = "gzip"
+        return response
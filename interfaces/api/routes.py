@@ -1,10 +1,96 @@
-from quart import request, jsonify, make_response, json
+from quart import request, Response
+import asyncio
+import hashlib
 import os
-import uuid
+import secrets
 import traceback
 
-UPLOAD_FOLDER = "uploads"
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+import orjson
+
+# Cached diagrams must be revalidated since the network can change
+DIAGRAM_CACHE_CONTROL = "private, no-cache"
+
+# Limits of the batch diagram endpoint
+BATCH_DIAGRAM_LIMIT = 64
+BATCH_RENDER_CONCURRENCY = 2
+
+SVG_MIMETYPE = "image/svg+xml"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Constant error responses, encoded once instead of on every request
+NO_NETWORK_ERROR = (orjson.dumps({"error": "No network available"}), 404, JSON_HEADERS)
+NO_NETWORK_STATUS = (orjson.dumps({"status": "No network loaded"}), 404, JSON_HEADERS)
+NO_FILE_ERROR = (
+    orjson.dumps({"error": "No file found in the request"}),
+    400,
+    JSON_HEADERS,
+)
+
+
+def _json_response(content):
+    """Build a JSON response, serializing the content with orjson."""
+    return Response(orjson.dumps(content), mimetype="application/json")
+
+
+def _accepts_gzip():
+    """Check whether the client of the current request accepts gzip bodies."""
+    return "gzip" in request.accept_encodings
+
+
+def _encoded_json_response(content, compressed):
+    """Build a response for an encoded JSON body, gzip compressed or not."""
+    headers = {"Vary": "Accept-Encoding"}
+    if compressed:
+        headers["Content-Encoding"] = "gzip"
+    return Response(content, mimetype="application/json", headers=headers)
+
+
+def _diagram_etag(network_service, *parts):
+    """Compute a strong ETag for a diagram of the current network.
+
+    The ETag covers the network and the way diagrams are rendered, so it
+    changes when either of them does.
+
+    Args:
+        network_service: Instance of NetworkService
+        *parts: Values identifying the diagram representation
+
+    Returns:
+        The ETag value, or None if no network is loaded
+    """
+    if not network_service.network_fingerprint:
+        return None
+
+    key = "\0".join(
+        (
+            network_service.network_fingerprint,
+            network_service.render_version,
+            *parts,
+        )
+    )
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def _not_modified(etag):
+    """Build a 304 response for a client that already has the diagram."""
+    # A 304 must carry the Vary header the full response would have had
+    return (
+        "",
+        304,
+        {
+            "ETag": f'"{etag}"',
+            "Cache-Control": DIAGRAM_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        },
+    )
+
+
+def _set_diagram_etag(response, etag):
+    """Attach the diagram validators to a response, if there is an ETag."""
+    if etag:
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = DIAGRAM_CACHE_CONTROL
+    return response
 
 
 def register_api_routes(app, network_service):
@@ -17,21 +103,29 @@ def register_api_routes(app, network_service):
 
     @app.route("/api/v1/config/iidm", methods=["POST"])
     async def upload_iidm():
-        """Endpoint to receive a large IIDM file via POST and convert it to JSON."""
-        try:
-            # First check if the request contains a file
-            files = await request.files
-            if "file" not in files:
-                return {"error": "No file found in the request"}, 400
-
-            file = files.get("file")
+        """Endpoint to receive a large IIDM file via POST and convert it to JSON.
 
+        The file is either sent as the "file" field of a multipart form, or as
+        the raw request body with an application/octet-stream content type.
+        """
+        try:
             # Generate a unique filename
-            unique_filename = f"{uuid.uuid4().hex}.xiidm"
+            unique_filename = f"{secrets.token_hex(16)}.xiidm"
             destination = os.path.join(network_service.UPLOAD_FOLDER, unique_filename)
 
-            # Write the file to disk using direct stream
-            await file.save(destination)
+            if request.mimetype == "application/octet-stream":
+                # Stream the raw body straight to disk, no multipart parsing
+                await network_service.save_upload_body(request.body, destination)
+            else:
+                # First check if the request contains a file
+                files = await request.files
+                if "file" not in files:
+                    return NO_FILE_ERROR
+
+                file = files.get("file")
+
+                # Write the file to disk using direct stream
+                await network_service.save_upload(file.stream, destination)
 
             # Process the file
             app.logger.info(
@@ -40,14 +134,11 @@ def register_api_routes(app, network_service):
             error = await network_service.process_iidm_file(destination)
 
             if error:
-                os.remove(destination)
+                await network_service.remove_upload(destination)
                 return {"error": f"Error during processing: {error}"}, 400
 
             app.logger.info(f"File received and successfully saved to {destination}.")
 
-            # After successful upload, clean up old files
-            await network_service.cleanup_old_networks()
-
             return {"status": "IIDM file loaded", "file_path": destination}, 201
 
         except Exception as e:
@@ -66,15 +157,19 @@ def register_api_routes(app, network_service):
         try:
             # Check if a network is available
             if not network_service.current_network:
-                return {"error": "No network available"}, 404
+                return NO_NETWORK_ERROR
 
             # Convert the network to JSON
-            json_content, error = await network_service.convert_network_to_json()
+            use_gzip = _accepts_gzip()
+            json_content, error = await network_service.convert_network_to_json(
+                use_gzip
+            )
 
             if error:
                 return {"error": f"Error converting network to JSON: {error}"}, 500
 
-            return jsonify(json_content)
+            # The export is already encoded, send it as is
+            return _encoded_json_response(json_content, use_gzip)
 
         except Exception as e:
             # Log the error for debugging
@@ -91,34 +186,17 @@ def register_api_routes(app, network_service):
         """
         try:
             if not network_service.current_network:
-                return {"status": "No network loaded"}, 404
+                return NO_NETWORK_STATUS
 
-            # Basic network info
+            # Basic network info, with element counts computed at load time
             info = {
                 "status": "Network loaded",
                 "file_path": network_service.current_file_path,
-                "filename": os.path.basename(network_service.current_file_path)
-                if network_service.current_file_path
-                else None,
+                "filename": network_service.current_filename,
+                **network_service.element_counts,
             }
 
-            try:
-                # Get additional network information
-                substations = network_service.current_network.get_substations()
-                voltage_levels = network_service.current_network.get_voltage_levels()
-                lines = network_service.current_network.get_lines()
-
-                info.update(
-                    {
-                        "substations_count": len(substations),
-                        "voltage_levels_count": len(voltage_levels),
-                        "lines_count": len(lines),
-                    }
-                )
-            except Exception as e:
-                info["warning"] = f"Error retrieving detailed network info: {str(e)}"
-
-            return jsonify(info)
+            return _json_response(info)
 
         except Exception as e:
             app.logger.error(f"Error when getting current network info: {str(e)}")
@@ -138,46 +216,118 @@ def register_api_routes(app, network_service):
         try:
             # Check if a network is available
             if not network_service.current_network:
-                return {"error": "No network available"}, 404
+                return NO_NETWORK_ERROR
 
             # Check if the ID exists in the network
-            if not await network_service.element_exists(id):
+            if not network_service.element_exists(id):
                 return {
                     "error": f"The identifier '{id}' doesn't exist in the network"
                 }, 404
 
+            # Let clients that already have this diagram skip the download
+            as_json = request.args.get("format") == "json"
+            use_gzip = _accepts_gzip()
+            variant = ("json" if as_json else "svg") + ("+gzip" if use_gzip else "")
+            etag = _diagram_etag(network_service, id, variant)
+            if etag and request.if_none_match.contains_weak(etag):
+                return _not_modified(etag)
+
             # Generate the SVG and metadata
-            svg_content, metadata = await network_service.generate_single_line_diagram(
-                id
-            )
+            diagram, error = await network_service.generate_single_line_diagram(id)
 
-            if svg_content is None:
+            if diagram is None:
                 return {
                     "error": "Failed to generate diagram",
-                    "details": metadata.get("error", "Unknown error"),
+                    "details": error or "Unknown error",
                 }, 500
 
+            # Encoded (and compressed) once per diagram, off the event loop
+            body = await network_service.get_diagram_body(diagram, variant)
+
             # Return format according to the request parameter
-            if request.args.get("format") == "json":
+            if as_json:
                 # Return SVG + metadata in JSON format
-                return jsonify({"svg": svg_content, "metadata": metadata})
+                response = _encoded_json_response(body, use_gzip)
             else:
                 # Return the SVG directly with the proper headers
-                response = await make_response(svg_content)
-                response.headers["Content-Type"] = "image/svg+xml"
-                response.headers["Content-Disposition"] = (
-                    f"inline; filename={id}_diagram.svg"
-                )
-                # Add metadata in a custom header
-                response.headers["X-Diagram-Metadata"] = json.dumps(metadata)
+                headers = {
+                    "Content-Disposition": f"inline; filename={id}_diagram.svg",
+                    # Add metadata in a custom header
+                    "X-Diagram-Metadata": diagram.metadata_header,
+                    "Vary": "Accept-Encoding",
+                }
+                if use_gzip:
+                    headers["Content-Encoding"] = "gzip"
+                response = Response(body, mimetype=SVG_MIMETYPE, headers=headers)
 
-                return response
+            return _set_diagram_etag(response, etag)
 
         except Exception as e:
             # Log the error for debugging
             app.logger.error(f"Error when generating diagram for {id}: {str(e)}")
             return {"error": f"Unable to generate diagram: {str(e)}"}, 500
 
+    @app.route("/api/v1/network/diagram/lines", methods=["GET"])
+    async def get_single_line_diagrams_batch():
+        """
+        Endpoint to get several single line diagrams in one streamed response.
+
+        The "ids" query parameter is a comma-separated list of voltage level or
+        substation IDs. Each diagram is sent as one NDJSON line holding its ID,
+        SVG and metadata (or an error), in the order they finish rendering.
+        """
+        try:
+            if not network_service.current_network:
+                return NO_NETWORK_ERROR
+
+            # Drop empty and duplicate IDs, keeping the requested order
+            ids = request.args.get("ids", "").split(",")
+            ids = list(dict.fromkeys(filter(None, ids)))
+            if not ids:
+                return {"error": "No diagram identifiers given"}, 400
+            if len(ids) > BATCH_DIAGRAM_LIMIT:
+                return {
+                    "error": f"At most {BATCH_DIAGRAM_LIMIT} diagrams can be requested at once"
+                }, 400
+
+            unknown = [id for id in ids if not network_service.element_exists(id)]
+            if unknown:
+                return {
+                    "error": f"Identifiers not found in the network: {', '.join(unknown)}"
+                }, 404
+
+            semaphore = asyncio.Semaphore(BATCH_RENDER_CONCURRENCY)
+
+            async def render(id):
+                async with semaphore:
+                    diagram, error = await network_service.generate_single_line_diagram(
+                        id
+                    )
+
+                if diagram is None:
+                    line = orjson.dumps({"id": id, "error": error or "Unknown error"})
+                else:
+                    # Splice the ID into the diagram's cached JSON object
+                    content = await network_service.get_diagram_body(diagram, "json")
+                    line = b'{"id":' + orjson.dumps(id) + b"," + content[1:]
+                return line + b"\n"
+
+            async def stream():
+                tasks = [asyncio.ensure_future(render(id)) for id in ids]
+                try:
+                    for next_line in asyncio.as_completed(tasks):
+                        yield await next_line
+                finally:
+                    # The client may disconnect before every diagram is sent
+                    for task in tasks:
+                        task.cancel()
+
+            return Response(stream(), mimetype="application/x-ndjson")
+
+        except Exception as e:
+            app.logger.error(f"Error when generating diagrams batch: {str(e)}")
+            return {"error": f"Unable to generate diagrams: {str(e)}"}, 500
+
     @app.route("/api/v1/network/diagram/line/<string:id>/metadata", methods=["GET"])
     async def get_single_line_diagram_metadata(id):
         """
@@ -185,22 +335,31 @@ def register_api_routes(app, network_service):
         """
         try:
             if not network_service.current_network:
-                return {"error": "No network available"}, 404
+                return NO_NETWORK_ERROR
 
-            if not await network_service.element_exists(id):
+            if not network_service.element_exists(id):
                 return {
                     "error": f"The identifier '{id}' doesn't exist in the network"
                 }, 404
 
-            _, metadata = await network_service.generate_single_line_diagram(id)
+            # Let clients that already have this metadata skip the download
+            use_gzip = _accepts_gzip()
+            variant = "metadata+gzip" if use_gzip else "metadata"
+            etag = _diagram_etag(network_service, id, variant)
+            if etag and request.if_none_match.contains_weak(etag):
+                return _not_modified(etag)
 
-            if metadata is None or "error" in metadata:
+            diagram, error = await network_service.generate_single_line_diagram(id)
+
+            if diagram is None:
                 return {
                     "error": "Failed to generate metadata",
-                    "details": metadata.get("error", "Unknown error"),
+                    "details": error or "Unknown error",
                 }, 500
 
-            return jsonify(metadata)
+            body = await network_service.get_diagram_body(diagram, variant)
+            response = _encoded_json_response(body, use_gzip)
+            return _set_diagram_etag(response, etag)
 
         except Exception as e:
             app.logger.error(f"Error when retrieving metadata for {id}: {str(e)}")
@@ -217,15 +376,16 @@ def register_api_routes(app, network_service):
         try:
             # Check if a network is available
             if not network_service.current_network:
-                return {"error": "No network available"}, 404
+                return NO_NETWORK_ERROR
 
             # Get substations JSON
-            substations_json, error = await network_service.get_substations()
+            use_gzip = _accepts_gzip()
+            substations_json, error = await network_service.get_substations(use_gzip)
 
             if error:
                 return {"error": f"Error retrieving substations: {error}"}, 500
 
-            return jsonify(substations_json)
+            return _encoded_json_response(substations_json, use_gzip)
 
         except Exception as e:
             # Log the error for debugging
@@ -243,15 +403,18 @@ def register_api_routes(app, network_service):
         try:
             # Check if a network is available
             if not network_service.current_network:
-                return {"error": "No network available"}, 404
+                return NO_NETWORK_ERROR
 
             # Get voltage levels JSON
-            voltage_levels_json, error = await network_service.get_voltage_levels()
+            use_gzip = _accepts_gzip()
+            voltage_levels_json, error = await network_service.get_voltage_levels(
+                use_gzip
+            )
 
             if error:
                 return {"error": f"Error retrieving voltage levels: {error}"}, 500
 
-            return jsonify(voltage_levels_json)
+            return _encoded_json_response(voltage_levels_json, use_gzip)
 
         except Exception as e:
             # Log the error for debugging
@@ -275,41 +438,19 @@ def register_api_routes(app, network_service):
         try:
             # Check if a network is available
             if not network_service.current_network:
-                return {"error": "No network available"}, 404
+                return NO_NETWORK_ERROR
 
             # Check if the substation exists
-            substations_df = network_service.current_network.get_substations()
-            if substation_id not in substations_df.index:
+            if not network_service.substation_exists(substation_id):
                 return {"error": f"Substation '{substation_id}' not found"}, 404
 
-            # Get all voltage levels
-            voltage_levels_df = network_service.current_network.get_voltage_levels()
-
-            # Filter voltage levels belonging to the specified substation
-            vl_for_substation = voltage_levels_df[
-                voltage_levels_df["substation_id"] == substation_id
-            ]
-
-            # Format as JSON response
-            result = {"substation_id": substation_id, "voltage_levels": []}
-
-            for vl_id, vl in vl_for_substation.iterrows():
-                vl_data = {
-                    "id": vl_id,
-                    "name": vl.get("name", ""),
-                    "nominal_v": vl.get("nominal_v", 0),
-                    "high_voltage_limit": vl.get("high_voltage_limit", 0),
-                    "low_voltage_limit": vl.get("low_voltage_limit", 0),
-                    "topology_kind": vl.get("topology_kind", ""),
-                }
-
-                # Add optional attributes if available
-                if "fictitious" in vl:
-                    vl_data["fictitious"] = bool(vl["fictitious"])
-
-                result["voltage_levels"].append(vl_data)
+            voltage_levels_json, error = (
+                await network_service.get_substation_voltage_levels(substation_id)
+            )
+            if error:
+                return {"error": error}, 500
 
-            return jsonify(result)
+            return Response(voltage_levels_json, mimetype="application/json")
 
         except Exception as e:
             # Log the error for debugging
@@ -2,17 +2,76 @@ from quart import Response
 import asyncio
 import time
 
+# Seconds between two health check events
+HEALTH_INTERVAL = 10
+
+
+class HealthTicker:
+    """Shared health check payload, refreshed once per interval for all clients."""
+
+    def __init__(self, interval: float = HEALTH_INTERVAL):
+        self.interval = interval
+        self.payload = b""
+        self._tick = asyncio.Event()
+        self._task = None
+
+    @staticmethod
+    def current_payload() -> bytes:
+        """Build the encoded SSE event for the current time."""
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+        return f'data: {{"status": "OK", "timestamp": "{timestamp}"}}\n\n'.encode()
+
+    async def wait(self) -> bytes:
+        """Wait for the next tick and return its payload."""
+        await self._tick.wait()
+        return self.payload
+
+    async def _run(self):
+        """Refresh the payload and wake up subscribers once per interval."""
+        while True:
+            await asyncio.sleep(self.interval)
+            self.payload = self.current_payload()
+
+            # Wake up current subscribers, later waits block on a fresh event
+            tick, self._tick = self._tick, asyncio.Event()
+            tick.set()
+
+    def start(self):
+        """Start refreshing the payload in a background task."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background task, if it is running."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
 
 def register_sse_routes(app):
+    ticker = HealthTicker()
+
+    @app.before_serving
+    async def start_health_ticker():
+        ticker.start()
+
+    @app.after_serving
+    async def stop_health_ticker():
+        await ticker.stop()
+
     @app.route("/health", methods=["GET"])
     async def health_check():
         """Endpoint SSE pour le health check."""
 
         async def stream():
+            # The shared payload can be up to an interval old, stamp the first
+            # event with the connection time
+            yield HealthTicker.current_payload()
             while True:
-                timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-                yield f'data: {{"status": "OK", "timestamp": "{timestamp}"}}\n\n'
-                await asyncio.sleep(10)
+                yield await ticker.wait()
 
         response = Response(stream(), mimetype="text/event-stream")
         response.headers["Cache-Control"] = "no-cache"
@@ -4,16 +4,33 @@ import hypercorn.asyncio
 import hypercorn.config
 from quart import Quart
 
+try:
+    import uvloop
+except ImportError:  # Optional, not available on Windows
+    uvloop = None
+
 from domain.network.services.network_service import NetworkService
+from interfaces.api.compression import register_compression
 from interfaces.api.routes import register_api_routes
 from interfaces.sse.routes import register_sse_routes
 
+# Seconds between two cleanups of old uploaded network files
+CLEANUP_INTERVAL = 300
+
+
+async def cleanup_periodically(network_service):
+    """Remove old network files at a regular interval."""
+    while True:
+        await asyncio.sleep(CLEANUP_INTERVAL)
+        await network_service.cleanup_old_networks(max_files=5)
+
 
 async def create_app():
     """Factory function to create and initialize the application."""
     # Create app
     app = Quart(__name__)
     app.config["MAX_CONTENT_LENGTH"] = 500 * 1024 * 1024  # 500 Mo
+    app.config["BODY_TIMEOUT"] = 300  # Match the server read timeout
 
     # Configure logging
     logging.basicConfig(
@@ -34,9 +51,26 @@ async def create_app():
     # Clean up old network files
     await network_service.cleanup_old_networks(max_files=5)
 
+    # Keep cleaning up old files in the background while serving
+    cleanup_task = None
+
+    @app.before_serving
+    async def start_cleanup():
+        nonlocal cleanup_task
+        cleanup_task = asyncio.create_task(cleanup_periodically(network_service))
+
+    @app.after_serving
+    async def stop_cleanup():
+        cleanup_task.cancel()
+        try:
+            await cleanup_task
+        except asyncio.CancelledError:
+            pass
+
     # Register all routes
     register_sse_routes(app)
     register_api_routes(app, network_service)
+    register_compression(app)
 
     return app
 
@@ -60,4 +94,8 @@ if __name__ == "__main__":
         app = await create_app()
         await hypercorn.asyncio.serve(app, config)
 
+    # Use the faster libuv-based event loop when it is installed
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     asyncio.run(main())